@@ -1,10 +1,15 @@
 import os
+import sys
 import openai
 
 openai.api_key = os.environ["OPENAI_API_KEY"]
 client = openai.OpenAI()
-response = client.responses.create(
+with client.responses.stream(
     model="gpt-5",
     input="Say 'Hello World' in an ascii art style"
-)   
-print(response.output[1].content[0].text)
\ No newline at end of file
+) as stream:
+    for event in stream:
+        if event.type == "response.output_text.delta":
+            sys.stdout.write(event.delta)
+            sys.stdout.flush()
+print()
@@ -1,9 +1,84 @@
+from __future__ import annotations
+
 import asyncio
 import json
-from typing import Any, Awaitable
+import threading
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine
+
+if TYPE_CHECKING:
+    import fastmcp
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup, unavailable on Windows
+    uvloop = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+_JSON_LEADING = frozenset('{["-tfn0123456789')
+_WRAPPER_KEYS = frozenset({"text", "data", "content"})
+_PARSE_CACHE_SIZE = 128
+_parse_cache: OrderedDict[str, Any] = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _fast_load(text: str) -> Any:
+    """Decode a payload string, trying JSON before falling back to YAML.
+
+    PyYAML is only imported the first time a payload is not JSON. Raises
+    ``ValueError`` if the payload cannot be decoded either way.
+    """
+    lead = text[:1]
+    if lead.isspace():
+        lead = text.lstrip()[:1]
+    if lead in _JSON_LEADING:
+        try:
+            return _json_loads(text)
+        except ValueError:
+            pass
+    import yaml
+
+    try:
+        return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    except yaml.YAMLError as exc:
+        raise ValueError(str(exc)) from exc
+
+
+def _cached_load(text: str) -> Any:
+    """``_fast_load`` with an LRU cache; results are shared, so treat them as read-only."""
+    with _parse_cache_lock:
+        if text in _parse_cache:
+            _parse_cache.move_to_end(text)
+            return _parse_cache[text]
+    decoded = _fast_load(text)
+    with _parse_cache_lock:
+        _parse_cache[text] = decoded
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return decoded
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
 
-import yaml
-import fastmcp
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="MCPBridgeLoop", daemon=True
+            ).start()
+            _loop = loop
+        return _loop
 
 
 class MCPBridgeError(RuntimeError):
@@ -11,75 +86,144 @@ class MCPBridgeError(RuntimeError):
 
 
 class MCPBridge:
-    """Synchronous facade around the asynchronous FastMCP client."""
+    """Synchronous facade around the asynchronous FastMCP client.
+
+    All bridges share one background event loop, and each keeps a single
+    client session open so calls reuse the connection instead of re-handshaking.
+    """
 
     def __init__(self, endpoint: str = "http://127.0.0.1:8000/mcp") -> None:
         self.endpoint = endpoint
+        self._client: fastmcp.Client | None = None
+        self._stack: AsyncExitStack | None = None
+        self._connect_lock = asyncio.Lock()
+        self._recordings_include_path = False
+        self._recordings_cache: tuple[str, dict[str, dict]] | None = None
 
-    def _run(self, coro: Awaitable[Any]) -> Any:
-        loop = asyncio.new_event_loop()
+    def _run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
         try:
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(coro)
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            return result
+            return future.result()
         except Exception as exc:  # pylint: disable=broad-except
             raise MCPBridgeError(str(exc)) from exc
-        finally:
-            asyncio.set_event_loop(None)
-            loop.close()
 
-    def _call_tool(self, name: str, args: dict | None = None) -> object:
-        async def _runner():
-            async with fastmcp.Client(self.endpoint) as client:
-                response = await client.call_tool(name, args or {})
-                payload = getattr(response, "data", None)
+    async def _connect(self) -> fastmcp.Client:
+        async with self._connect_lock:
+            if self._client is None:
+                import fastmcp
+
+                stack = AsyncExitStack()
                 try:
-                    if callable(payload):
-                        payload = payload()
-                    if asyncio.iscoroutine(payload):
-                        payload = await payload
-                except TypeError:
-                    payload = None
-                return payload
+                    client = await stack.enter_async_context(fastmcp.Client(self.endpoint))
+                except BaseException:
+                    await stack.aclose()
+                    raise
+                self._stack = stack
+                self._client = client
+            return self._client
+
+    async def _disconnect(self) -> None:
+        stack = self._stack
+        self._stack = None
+        self._client = None
+        if stack is None:
+            return
+        try:
+            await stack.aclose()
+        except Exception:  # pylint: disable=broad-except
+            pass
 
-        return self._run(_runner())
+    async def _with_client(
+        self,
+        operation: Callable[[fastmcp.Client], Awaitable[Any]],
+        idempotent: bool = False,
+    ) -> Any:
+        """Run ``operation`` on the shared session.
+
+        A session that is already closed is replaced before anything is sent.
+        Once a request has gone out, a failure drops the session and is only
+        retried for ``idempotent`` operations: a tool call may have run on the
+        server before its response was lost, and must not be sent twice.
+        """
+        from fastmcp.exceptions import ToolError
+
+        client = await self._connect()
+        if not client.is_connected():
+            await self._disconnect()
+            client = await self._connect()
+        try:
+            return await operation(client)
+        except ToolError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            await self._disconnect()
+            if not idempotent:
+                raise
+        return await operation(await self._connect())
+
+    def close(self) -> None:
+        """Close the shared session; the background loop stays up for reuse."""
+        if self._client is None:
+            return
+        try:
+            self._run(self._disconnect())
+        except MCPBridgeError:
+            pass
+
+    def _call_tool(self, name: str, args: dict | None = None) -> object:
+        async def _runner(client: fastmcp.Client):
+            response = await client.call_tool(name, args or {})
+            payload = getattr(response, "data", None)
+            try:
+                if callable(payload):
+                    payload = payload()
+                if asyncio.iscoroutine(payload):
+                    payload = await payload
+            except TypeError:
+                payload = None
+            return payload
+
+        return self._run(self._with_client(_runner))
 
     def _read_resource(self, uri: str) -> object:
-        async def _runner():
-            async with fastmcp.Client(self.endpoint) as client:
-                records = await client.read_resource(uri)
-                if not records:
-                    return None
-                record = records[0]
-                for attr in ("json", "data", "text", "content"):
-                    if not hasattr(record, attr):
-                        continue
-                    value = getattr(record, attr)
-                    try:
-                        if callable(value):
-                            value = value()
-                        if asyncio.iscoroutine(value):
-                            value = await value
-                    except TypeError:
-                        continue
-                    if value is not None:
-                        return value
-                if hasattr(record, "model_dump"):
-                    return record.model_dump()
-                if hasattr(record, "__dict__"):
-                    return dict(record.__dict__)
+        return self._run(self._read_resource_async(uri))
+
+    async def _read_resource_async(self, uri: str) -> object:
+        async def _runner(client: fastmcp.Client):
+            records = await client.read_resource(uri)
+            if not records:
                 return None
+            record = records[0]
+            for attr in ("json", "data", "text", "content"):
+                if not hasattr(record, attr):
+                    continue
+                value = getattr(record, attr)
+                try:
+                    if callable(value):
+                        value = value()
+                    if asyncio.iscoroutine(value):
+                        value = await value
+                except TypeError:
+                    continue
+                if value is not None:
+                    return value
+            if hasattr(record, "model_dump"):
+                return record.model_dump()
+            if hasattr(record, "__dict__"):
+                return dict(record.__dict__)
+            return None
 
-        return self._run(_runner())
+        return await self._with_client(_runner, idempotent=True)
 
     @staticmethod
     def _unwrap_payload(payload: object) -> object:
         """Peel away common wrapper structures (ResourceContent, JSON-in-string, etc.)."""
         for _ in range(8):
-            if payload is None:
+            if payload is None or isinstance(payload, (list, tuple)):
                 break
             if isinstance(payload, dict):
+                if _WRAPPER_KEYS.isdisjoint(payload.keys()):
+                    break
                 text_value = payload.get("text")
                 data_value = payload.get("data")
                 content_value = payload.get("content")
@@ -94,8 +238,8 @@ class MCPBridge:
                     continue
             if isinstance(payload, str):
                 try:
-                    decoded = yaml.safe_load(payload)
-                except yaml.YAMLError:
+                    decoded = _cached_load(payload)
+                except ValueError:
                     break
                 if decoded is None:
                     break
@@ -126,8 +270,72 @@ class MCPBridge:
         return bool(self._call_tool("delete", {"name": name}))
 
     def fetch_recordings(self) -> dict[str, dict]:
-        raw = self._read_resource("data://recordings")
-        raw = self._unwrap_payload(raw)
+        return self._recordings_from_raw(self._read_resource("data://recordings"))
+
+    def fetch_current_path(self) -> str | None:
+        return self._parse_current_path(self._read_resource("data://curr"))
+
+    def fetch_recordings_and_current(self) -> tuple[dict[str, dict], str | None]:
+        """Read the recordings table and current take path concurrently.
+
+        Once the server is seen to embed the current path in the recordings
+        table, the separate ``data://curr`` read is skipped. A failure reading
+        the current path yields ``None`` rather than an error, matching how
+        callers treat ``fetch_current_path`` as best-effort.
+        """
+        if self._recordings_include_path:
+            recordings = self.fetch_recordings()
+            path = self._embedded_current_path(recordings)
+            if path is None:
+                try:
+                    path = self.fetch_current_path()
+                except MCPBridgeError:
+                    path = None
+            return recordings, path
+
+        async def _runner():
+            return await asyncio.gather(
+                self._read_resource_async("data://recordings"),
+                self._read_resource_async("data://curr"),
+                return_exceptions=True,
+            )
+
+        raw_recordings, raw_curr = self._run(_runner())
+        if isinstance(raw_recordings, BaseException):
+            raise MCPBridgeError(str(raw_recordings)) from raw_recordings
+        recordings = self._recordings_from_raw(raw_recordings)
+        embedded = self._embedded_current_path(recordings)
+        if embedded is not None:
+            self._recordings_include_path = True
+            return recordings, embedded
+        if isinstance(raw_curr, BaseException):
+            return recordings, None
+        try:
+            return recordings, self._parse_current_path(raw_curr)
+        except MCPBridgeError:
+            return recordings, None
+
+    @staticmethod
+    def _embedded_current_path(recordings: dict[str, dict]) -> str | None:
+        curr = recordings.get("curr")
+        if isinstance(curr, dict) and curr.get("path"):
+            return str(curr["path"])
+        return None
+
+    def _recordings_from_raw(self, raw: object) -> dict[str, dict]:
+        """Parse a recordings payload, reusing the last result if the text is unchanged."""
+        if not isinstance(raw, str):
+            return self._parse_recordings(raw)
+        cached = self._recordings_cache
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        recordings = self._parse_recordings(raw)
+        self._recordings_cache = (raw, recordings)
+        return recordings
+
+    @classmethod
+    def _parse_recordings(cls, raw: object) -> dict[str, dict]:
+        raw = cls._unwrap_payload(raw)
         if raw is None:
             return {}
         if isinstance(raw, dict):
@@ -143,38 +351,35 @@ class MCPBridge:
                             collected[str(key)] = data
                         else:
                             try:
-                                loaded = yaml.safe_load(str(data))
+                                loaded = _fast_load(str(data))
                                 if isinstance(loaded, dict):
                                     collected[str(key)] = loaded
-                            except yaml.YAMLError:
+                            except ValueError:
                                 continue
             if collected:
                 return collected
         if isinstance(raw, str):
             try:
-                return yaml.safe_load(raw) or {}
-            except yaml.YAMLError:
-                try:
-                    return json.loads(raw)
-                except json.JSONDecodeError as exc:
-                    raise MCPBridgeError(
-                        f"Could not parse recordings metadata: {exc}"
-                    ) from exc
+                return _fast_load(raw) or {}
+            except ValueError as exc:
+                raise MCPBridgeError(
+                    f"Could not parse recordings metadata: {exc}"
+                ) from exc
         if hasattr(raw, "model_dump"):
             dumped = raw.model_dump()
             if isinstance(dumped, dict):
                 return dumped
         try:
-            fallback = yaml.safe_load(str(raw))
+            fallback = _fast_load(str(raw))
             if isinstance(fallback, dict):
                 return fallback
-        except yaml.YAMLError:
+        except ValueError:
             pass
         raise MCPBridgeError(f"Unexpected recordings payload type: {type(raw)!r}")
 
-    def fetch_current_path(self) -> str | None:
-        raw = self._read_resource("data://curr")
-        raw = self._unwrap_payload(raw)
+    @classmethod
+    def _parse_current_path(cls, raw: object) -> str | None:
+        raw = cls._unwrap_payload(raw)
         if raw is None:
             return None
         if isinstance(raw, str):
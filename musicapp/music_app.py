@@ -1,9 +1,23 @@
+import asyncio
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QColor, QFont, QImage, QPixmap
+from typing import Any, Callable, Optional
+
+from PyQt5.QtCore import (
+    QAbstractTableModel,
+    QBuffer,
+    QIODevice,
+    QItemSelectionModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    Qt,
+    QThread,
+    QThreadPool,
+    pyqtSignal,
+)
+from PyQt5.QtGui import QCloseEvent, QColor, QFont, QImage, QPixmap
 from PyQt5.QtWidgets import (
     QApplication,
     QGridLayout,
@@ -15,8 +29,8 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QScrollArea,
-    QTableWidget,
-    QTableWidgetItem,
+    QAbstractItemView,
+    QTableView,
     QVBoxLayout,
     QWidget,
     QHeaderView,
@@ -24,12 +38,102 @@ from PyQt5.QtWidgets import (
 
 try:
     from .mcp_bridge import MCPBridge, MCPBridgeError
-    from .spectrogram import SpectrogramError, generate_spectrogram, resolve_audio_path
+    from .spectrogram import (
+        SpectrogramAssets,
+        SpectrogramError,
+        audio_cache_key,
+        generate_spectrogram,
+        resolve_audio_path,
+    )
     from .spectrogram_analysis import SpectrogramAnalysisError, analyze_spectrogram
+    from .spectrogram_analysis import close as close_analysis
 except ImportError:
     from mcp_bridge import MCPBridge, MCPBridgeError  # type: ignore
-    from spectrogram import SpectrogramError, generate_spectrogram, resolve_audio_path  # type: ignore
+    from spectrogram import (  # type: ignore
+        SpectrogramAssets,
+        SpectrogramError,
+        audio_cache_key,
+        generate_spectrogram,
+        resolve_audio_path,
+    )
     from spectrogram_analysis import SpectrogramAnalysisError, analyze_spectrogram  # type: ignore
+    from spectrogram_analysis import close as close_analysis  # type: ignore
+
+
+_DARK_QSS = """
+    QWidget {
+        background-color: #0d1117;
+        color: #f0f6fc;
+    }
+    QPushButton {
+        background-color: #161b22;
+        color: #f0f6fc;
+        border: 1px solid #30363d;
+        border-radius: 4px;
+        padding: 6px 12px;
+    }
+    QPushButton:disabled {
+        background-color: #161b22;
+        color: #4b5563;
+        border-color: #22272e;
+    }
+    QPushButton[link="true"] {
+        padding: 4px;
+        color: #58a6ff;
+        background-color: transparent;
+        border: none;
+    }
+    QLineEdit {
+        background-color: #161b22;
+        color: #f0f6fc;
+        border: 1px solid #30363d;
+        border-radius: 4px;
+        padding: 4px 8px;
+    }
+    QTableView {
+        background-color: #161b22;
+        alternate-background-color: #11161d;
+        color: #f0f6fc;
+        gridline-color: #30363d;
+    }
+    QTableView::item:selected {
+        background-color: #1f6feb;
+        color: #f0f6fc;
+    }
+    QTableCornerButton::section {
+        background-color: #161b22;
+        border: 1px solid #30363d;
+    }
+    QHeaderView::section {
+        background-color: #161b22;
+        color: #f0f6fc;
+        padding: 6px;
+        border: 0px;
+    }
+    QScrollArea {
+        background-color: #0d1117;
+        border: none;
+    }
+    QScrollBar:vertical, QScrollBar:horizontal {
+        background: #0d1117;
+        width: 12px;
+        height: 12px;
+    }
+    QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
+        background: #30363d;
+        border-radius: 6px;
+    }
+"""
+
+
+# How long closing the window waits for in-flight bridge calls to return
+_CLOSE_WAIT_MS = 3000
+
+_SIZE_UNITS = (
+    ("{} B", 1),
+    ("{:.1f} KB", 1024),
+    ("{:.2f} MB", 1024 * 1024),
+)
 
 
 @dataclass
@@ -39,14 +143,76 @@ class RecordingMetadata:
     duration_seconds: float
 
     def formatted_size(self) -> str:
-        if self.size_bytes < 1024:
-            return f"{self.size_bytes} B"
-        if self.size_bytes < 1024 * 1024:
-            return f"{self.size_bytes / 1024:.1f} KB"
-        return f"{self.size_bytes / (1024 * 1024):.2f} MB"
+        return _format_size(self.size_bytes)
 
     def formatted_duration(self) -> str:
-        return f"{self.duration_seconds:.2f} s"
+        return _format_duration(self.duration_seconds)
+
+
+# The table model formats cells on every repaint and the same sizes and
+# durations come back across refreshes, so keep the strings around.
+@lru_cache(maxsize=1024)
+def _format_size(size_bytes: int) -> str:
+    unit = min(2, max(0, (max(size_bytes, 0).bit_length() - 1) // 10))
+    if not unit:
+        return f"{size_bytes} B"
+    template, divisor = _SIZE_UNITS[unit]
+    return template.format(size_bytes / divisor)
+
+
+@lru_cache(maxsize=1024)
+def _format_duration(duration_seconds: float) -> str:
+    return f"{duration_seconds:.2f} s"
+
+
+class RecordingsModel(QAbstractTableModel):
+    """Read-only table model that renders ``RecordingMetadata`` rows on demand."""
+
+    HEADERS = ("Name", "Size", "Duration")
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._rows: list[RecordingMetadata] = []
+
+    def set_rows(self, rows: list[RecordingMetadata]) -> None:
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def row_name(self, row: int) -> Optional[str]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row].name
+        return None
+
+    def row_of(self, name: str) -> int:
+        for row, meta in enumerate(self._rows):
+            if meta.name == name:
+                return row
+        return -1
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802 - Qt API
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802 - Qt API
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        meta = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return meta.name
+        if column == 1:
+            return meta.formatted_size()
+        return meta.formatted_duration()
+
+    def headerData(  # noqa: N802 - Qt API
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole
+    ) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
 
 
 class SpectrogramAnalysisThread(QThread):
@@ -68,6 +234,67 @@ class SpectrogramAnalysisThread(QThread):
             self.completed.emit(result.text)
 
 
+class BridgeWorkerSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class BridgeWorker(QRunnable):
+    """Run a blocking bridge call on the global thread pool."""
+
+    expected_errors: tuple[type[Exception], ...] = (MCPBridgeError,)
+    description = "MCP call"
+
+    def __init__(self, fn: Callable[..., Any], *args: Any) -> None:
+        super().__init__()
+        self._fn = fn
+        self._args = args
+        self.signals = BridgeWorkerSignals()
+
+    def run(self) -> None:  # pragma: no cover - thread execution
+        try:
+            result = self._fn(*self._args)
+        except self.expected_errors as exc:
+            self.signals.error.emit(str(exc))
+        except Exception as exc:  # pylint: disable=broad-except
+            self.signals.error.emit(f"Unexpected error during {self.description}: {exc}")
+        else:
+            self.signals.result.emit(result)
+
+
+class SpectrogramJob(BridgeWorker):
+    """Resolve the current take and render its spectrogram on the thread pool.
+
+    Emits ``(audio_path, cache_key, assets)``; ``assets`` is ``None`` when the
+    file still matches ``cached_key`` and the previous render can be reused.
+    """
+
+    expected_errors = (SpectrogramError, MCPBridgeError)
+    description = "spectrogram generation"
+
+    def __init__(
+        self,
+        curr_path: Optional[str],
+        bridge: MCPBridge,
+        fallback: Path,
+        cached_key: Optional[tuple[str, int, int]],
+    ) -> None:
+        super().__init__(self._render, curr_path, bridge, fallback, cached_key)
+
+    @staticmethod
+    def _render(
+        curr_path: Optional[str],
+        bridge: MCPBridge,
+        fallback: Path,
+        cached_key: Optional[tuple[str, int, int]],
+    ) -> tuple[Path, Optional[tuple[str, int, int]], Optional[SpectrogramAssets]]:
+        audio_path = resolve_audio_path(curr_path, bridge, fallback)
+        key = audio_cache_key(audio_path)
+        if key is not None and key == cached_key:
+            return audio_path, key, None
+        return audio_path, key, generate_spectrogram(audio_path)
+
+
 class MusicApp(QWidget):
     def __init__(self, bridge: Optional[MCPBridge] = None) -> None:
         super().__init__()
@@ -75,18 +302,34 @@ class MusicApp(QWidget):
         self.is_recording = False
         self.is_playing = False
         self.recordings: list[RecordingMetadata] = []
+        self._last_recordings_snapshot: list[tuple[str, int, float]] = []
         self.curr_metadata: Optional[RecordingMetadata] = None
         self.curr_path: Optional[str] = None
         self._last_spectrogram_image: Optional[QImage] = None
+        self._last_spectrogram_pixmap: Optional[QPixmap] = None
+        self._last_spectrogram_png: Optional[bytes] = None
         self._last_spectrogram_source: Optional[Path] = None
         self._last_spectrogram_title: Optional[str] = None
+        self._last_spectrogram_key: Optional[tuple[str, int, int]] = None
         self._analysis_thread: Optional[SpectrogramAnalysisThread] = None
+        self._workers: set[BridgeWorker] = set()
+        self._refresh_in_flight = False
+        self._refresh_pending = False
+        self._fallback_path = Path(__file__).resolve().parent.parent / "musicmcp" / "curr.wav"
 
         self.setWindowTitle("Music MCP Controller")
         self._build_ui()
         self._apply_dark_theme()
         self._refresh_metadata()
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        QThreadPool.globalInstance().waitForDone(_CLOSE_WAIT_MS)
+        if self._analysis_thread is not None:
+            self._analysis_thread.wait(_CLOSE_WAIT_MS)
+        self.bridge.close()
+        close_analysis()  # removes this session's uploads from the OpenAI account
+        super().closeEvent(event)
+
     def _build_ui(self) -> None:
         layout = QVBoxLayout()
 
@@ -97,9 +340,7 @@ class MusicApp(QWidget):
         self.curr_info_label = QLabel("Size: N/A    Duration: N/A")
         self.refresh_button = QPushButton("Refresh Metadata")
         self.refresh_button.setFlat(True)
-        self.refresh_button.setStyleSheet(
-            "padding: 4px; color: #58a6ff; background-color: transparent; border: none;"
-        )
+        self.refresh_button.setProperty("link", True)
         curr_layout.addWidget(self.curr_path_label)
         curr_row.addWidget(self.curr_info_label)
         curr_row.addStretch(1)
@@ -127,19 +368,13 @@ class MusicApp(QWidget):
         analysis_layout = QHBoxLayout()
         self.analyze_button = QPushButton("Analyze Spectrogram")
         self.analyze_button.setFlat(True)
-        self.analyze_button.setStyleSheet(
-            "padding: 4px; color: #58a6ff; background-color: transparent; border: none;"
-        )
+        self.analyze_button.setProperty("link", True)
         self.spectrogram_button = QPushButton("Show Spectrogram")
         self.spectrogram_button.setFlat(True)
-        self.spectrogram_button.setStyleSheet(
-            "padding: 4px; color: #58a6ff; background-color: transparent; border: none;"
-        )
+        self.spectrogram_button.setProperty("link", True)
         self.export_spectrogram_button = QPushButton("Export Spectrogram")
         self.export_spectrogram_button.setFlat(True)
-        self.export_spectrogram_button.setStyleSheet(
-            "padding: 4px; color: #58a6ff; background-color: transparent; border: none;"
-        )
+        self.export_spectrogram_button.setProperty("link", True)
         analysis_layout.addStretch(1)
         analysis_layout.addWidget(self.spectrogram_button)
         analysis_layout.addWidget(self.analyze_button)
@@ -156,13 +391,18 @@ class MusicApp(QWidget):
         layout.addLayout(save_layout)
 
         # Table of recordings
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Name", "Size", "Duration"])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.recordings_model = RecordingsModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.recordings_model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setAlternatingRowColors(True)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.Stretch)
+        # The view keeps these objects for as long as the model is not swapped,
+        # so look them up once instead of on every selection change.
+        self._selection_model = self.table.selectionModel()
+        self._header = self.table.horizontalHeader()
+        self._viewport = self.table.viewport()
+        self._header.setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.table)
 
         # Actions for saved takes
@@ -183,72 +423,11 @@ class MusicApp(QWidget):
         self._wire_events()
 
     def _apply_dark_theme(self) -> None:
-        accent = "#58a6ff"
-        self.setStyleSheet(
-            """
-            QWidget {
-                background-color: #0d1117;
-                color: #f0f6fc;
-            }
-            QPushButton {
-                background-color: #161b22;
-                color: #f0f6fc;
-                border: 1px solid #30363d;
-                border-radius: 4px;
-                padding: 6px 12px;
-            }
-            QPushButton:disabled {
-                background-color: #161b22;
-                color: #4b5563;
-                border-color: #22272e;
-            }
-            QLineEdit {
-                background-color: #161b22;
-                color: #f0f6fc;
-                border: 1px solid #30363d;
-                border-radius: 4px;
-                padding: 4px 8px;
-            }
-            QTableWidget {
-                background-color: #161b22;
-                alternate-background-color: #11161d;
-                color: #f0f6fc;
-                gridline-color: #30363d;
-            }
-            QTableWidget::item:selected {
-                background-color: #1f6feb;
-                color: #f0f6fc;
-            }
-            QTableCornerButton::section {
-                background-color: #161b22;
-                border: 1px solid #30363d;
-            }
-            QHeaderView::section {
-                background-color: #161b22;
-                color: #f0f6fc;
-                padding: 6px;
-                border: 0px;
-            }
-            QScrollArea {
-                background-color: #0d1117;
-                border: none;
-            }
-            QScrollBar:vertical, QScrollBar:horizontal {
-                background: #0d1117;
-                width: 12px;
-                height: 12px;
-            }
-            QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
-                background: #30363d;
-                border-radius: 6px;
-            }
-            """
-        )
-        link_style = f"padding: 4px; color: {accent}; background-color: transparent; border: none;"
-        self.refresh_button.setStyleSheet(link_style)
-        self.spectrogram_button.setStyleSheet(link_style)
-        self.analyze_button.setStyleSheet(link_style)
-        self.export_spectrogram_button.setStyleSheet(link_style)
+        app = QApplication.instance()
+        if app is not None:
+            app.setStyleSheet(_DARK_QSS)
+        else:
+            self.setStyleSheet(_DARK_QSS)
 
     def _wire_events(self) -> None:
         self.record_button.clicked.connect(self._handle_start_recording)
@@ -262,10 +441,10 @@ class MusicApp(QWidget):
         self.spectrogram_button.clicked.connect(self._handle_show_spectrogram)
         self.analyze_button.clicked.connect(self._handle_analyze_spectrogram)
         self.export_spectrogram_button.clicked.connect(self._handle_export_spectrogram)
-        self.table.selectionModel().selectionChanged.connect(self._update_selection_state)
+        self._selection_model.selectionChanged.connect(self._update_selection_state)
 
     def _update_selection_state(self) -> None:
-        has_selection = bool(self.table.selectionModel().selectedRows())
+        has_selection = bool(self._selection_model.selectedRows())
         self.set_curr_button.setEnabled(has_selection)
         self.delete_button.setEnabled(has_selection)
 
@@ -276,99 +455,139 @@ class MusicApp(QWidget):
         QMessageBox.critical(self, "Error", message)
         self._set_status(f"Error: {message}")
 
+    def _run_bridge(
+        self,
+        button: QPushButton,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: Callable[[Any], None],
+        on_error: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Call ``fn`` off the GUI thread, disabling ``button`` until it returns."""
+        self._submit(button, BridgeWorker(fn, *args), on_result, on_error)
+
+    def _submit(
+        self,
+        button: QPushButton,
+        worker: BridgeWorker,
+        on_result: Callable[[Any], None],
+        on_error: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self._workers.add(worker)
+        button.setEnabled(False)
+
+        def _finish() -> None:
+            self._workers.discard(worker)
+            button.setEnabled(True)
+
+        def _handle_result(value: object) -> None:
+            _finish()
+            on_result(value)
+
+        def _handle_error(message: str) -> None:
+            _finish()
+            (on_error or self._show_error)(message)
+
+        worker.signals.result.connect(_handle_result, Qt.QueuedConnection)
+        worker.signals.error.connect(_handle_error, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(worker)
+
     def _handle_start_recording(self) -> None:
-        try:
-            if not self.bridge.start_recording():
-                self._show_error("Recording already running or failed to start.")
-                return
-            self.is_recording = True
-            self._set_status("Recording...")
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+        self._run_bridge(
+            self.record_button,
+            self.bridge.start_recording,
+            on_result=self._on_recording_started,
+        )
+
+    def _on_recording_started(self, started: bool) -> None:
+        if not started:
+            self._show_error("Recording already running or failed to start.")
             return
+        self.is_recording = True
+        self._set_status("Recording...")
         self._update_controls()
 
     def _handle_stop_recording(self) -> None:
-        try:
-            if not self.bridge.stop_recording():
-                self._show_error("Recording was not running.")
-                return
-            self.is_recording = False
-            self._set_status("Recording stopped.")
-            self._refresh_metadata()
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+        self._run_bridge(
+            self.stop_record_button,
+            self.bridge.stop_recording,
+            on_result=self._on_recording_stopped,
+            on_error=self._on_recording_stop_failed,
+        )
+
+    def _on_recording_stopped(self, stopped: bool) -> None:
+        if not stopped:
+            self._show_error("Recording was not running.")
+            return
+        self.is_recording = False
+        self._set_status("Recording stopped.")
+        self._refresh_metadata()
+        self._update_controls()
+
+    def _on_recording_stop_failed(self, message: str) -> None:
+        self._show_error(message)
         self._update_controls()
 
     def _handle_start_playback(self) -> None:
-        try:
-            if not self.bridge.start_playback():
-                self._show_error("Playback already running or no audio available.")
-                return
-            self.is_playing = True
-            self._set_status("Playing current take...")
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+        self._run_bridge(
+            self.play_button,
+            self.bridge.start_playback,
+            on_result=self._on_playback_started,
+        )
+
+    def _on_playback_started(self, started: bool) -> None:
+        if not started:
+            self._show_error("Playback already running or no audio available.")
             return
+        self.is_playing = True
+        self._set_status("Playing current take...")
         self._update_controls()
 
     def _handle_stop_playback(self) -> None:
-        try:
-            if not self.bridge.stop_playback():
-                self._show_error("Playback was not running.")
-                self._set_status("Ready.")
-            else:
-                self._set_status("Playback stopped.")
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+        self._run_bridge(
+            self.stop_play_button,
+            self.bridge.stop_playback,
+            on_result=self._on_playback_stopped,
+            on_error=self._on_playback_stop_failed,
+        )
+
+    def _on_playback_stopped(self, stopped: bool) -> None:
+        if not stopped:
+            self._show_error("Playback was not running.")
             self._set_status("Ready.")
-        finally:
-            self.is_playing = False
-            self._update_controls()
+        else:
+            self._set_status("Playback stopped.")
+        self.is_playing = False
+        self._update_controls()
+
+    def _on_playback_stop_failed(self, message: str) -> None:
+        self._show_error(message)
+        self._set_status("Ready.")
+        self.is_playing = False
+        self._update_controls()
 
     def _handle_show_spectrogram(self) -> None:
-        fallback = self._fallback_audio_path()
-        try:
-            audio_path = resolve_audio_path(self.curr_path, self.bridge, fallback)
-            assets = generate_spectrogram(audio_path)
-        except SpectrogramError as exc:
-            self._show_error(str(exc))
-            return
-        self._cache_spectrogram(assets.image, audio_path, assets.title)
+        self._with_spectrogram(self.spectrogram_button, self._show_spectrogram_dialog)
 
+    def _show_spectrogram_dialog(self, audio_path: Path) -> None:
+        pixmap = self._last_spectrogram_pixmap
         dialog = QDialog(self)
-        dialog.setWindowTitle(assets.title)
+        dialog.setWindowTitle(self._last_spectrogram_title or "Spectrogram")
         dialog_layout = QVBoxLayout(dialog)
         scroll = QScrollArea(dialog)
         scroll.setWidgetResizable(True)
         image_label = QLabel()
-        image_label.setPixmap(assets.pixmap)
+        image_label.setPixmap(pixmap)
         scroll.setWidget(image_label)
         dialog_layout.addWidget(scroll)
-        dialog.resize(min(assets.pixmap.width() + 40, 900), min(assets.pixmap.height() + 80, 700))
+        dialog.resize(min(pixmap.width() + 40, 900), min(pixmap.height() + 80, 700))
         dialog.exec_()
         self._set_status("Spectrogram generated.")
 
     def _handle_export_spectrogram(self) -> None:
-        fallback = self._fallback_audio_path()
-        try:
-            audio_path = resolve_audio_path(self.curr_path, self.bridge, fallback)
-        except SpectrogramError as exc:
-            self._show_error(str(exc))
-            return
-        regenerate = (
-            self._last_spectrogram_image is None
-            or self._last_spectrogram_source is None
-            or self._last_spectrogram_source != audio_path.resolve()
-        )
-        if regenerate:
-            try:
-                assets = generate_spectrogram(audio_path)
-            except SpectrogramError as exc:
-                self._show_error(str(exc))
-                return
-            self._cache_spectrogram(assets.image, audio_path, assets.title)
+        self._with_spectrogram(self.export_spectrogram_button, self._export_spectrogram)
 
+    def _export_spectrogram(self, audio_path: Path) -> None:
         default_name = f"{audio_path.stem}_spectrogram.png"
         initial_dir = (
             str((self._last_spectrogram_source or audio_path).parent)
@@ -384,32 +603,21 @@ class MusicApp(QWidget):
         target = Path(save_path)
         if target.suffix.lower() != ".png":
             target = target.with_suffix(".png")
-        if not self._last_spectrogram_image or not self._last_spectrogram_image.save(str(target), "PNG"):
+        png = self._spectrogram_png()
+        if png is None:
             self._show_error("Failed to save spectrogram image.")
             return
-        self._set_status(f"Spectrogram exported to {target}.")
-
-    def _handle_analyze_spectrogram(self) -> None:
-        fallback = self._fallback_audio_path()
         try:
-            audio_path = resolve_audio_path(self.curr_path, self.bridge, fallback)
-        except SpectrogramError as exc:
-            self._show_error(str(exc))
+            target.write_bytes(png)
+        except OSError as exc:
+            self._show_error(f"Failed to save spectrogram image: {exc}")
             return
+        self._set_status(f"Spectrogram exported to {target}.")
 
-        regenerate = (
-            self._last_spectrogram_image is None
-            or self._last_spectrogram_source is None
-            or self._last_spectrogram_source != audio_path.resolve()
-        )
-        if regenerate:
-            try:
-                assets = generate_spectrogram(audio_path)
-            except SpectrogramError as exc:
-                self._show_error(str(exc))
-                return
-            self._cache_spectrogram(assets.image, audio_path, assets.title)
+    def _handle_analyze_spectrogram(self) -> None:
+        self._with_spectrogram(self.analyze_button, self._analyze_spectrogram)
 
+    def _analyze_spectrogram(self, audio_path: Path) -> None:
         if self._last_spectrogram_image is None:
             self._show_error("Spectrogram image unavailable.")
             return
@@ -424,12 +632,44 @@ class MusicApp(QWidget):
         self._analysis_thread.start()
 
     def _fallback_audio_path(self) -> Path:
-        return Path(__file__).resolve().parent.parent / "musicmcp" / "curr.wav"
+        return self._fallback_path
+
+    def _with_spectrogram(self, button: QPushButton, then: Callable[[Path], None]) -> None:
+        """Render (or reuse) the current take's spectrogram off the GUI thread, then call ``then``."""
+        job = SpectrogramJob(
+            self.curr_path, self.bridge, self._fallback_audio_path(), self._last_spectrogram_key
+        )
+
+        def _on_ready(
+            rendered: tuple[Path, Optional[tuple[str, int, int]], Optional[SpectrogramAssets]]
+        ) -> None:
+            audio_path, key, assets = rendered
+            if assets is not None:
+                self._cache_spectrogram(assets, audio_path, key)
+            elif self._last_spectrogram_image is None:
+                self._show_error("Spectrogram image unavailable.")
+                return
+            then(audio_path)
+
+        self._submit(button, job, _on_ready)
 
-    def _cache_spectrogram(self, image: QImage, source: Path, title: str) -> None:
-        self._last_spectrogram_image = image.copy()
+    def _cache_spectrogram(
+        self, assets: SpectrogramAssets, source: Path, key: Optional[tuple[str, int, int]]
+    ) -> None:
+        self._last_spectrogram_image = assets.image.copy()
+        self._last_spectrogram_pixmap = assets.pixmap
+        self._last_spectrogram_png = None
         self._last_spectrogram_source = source.resolve()
-        self._last_spectrogram_title = title
+        self._last_spectrogram_title = assets.title
+        self._last_spectrogram_key = key
+
+    def _spectrogram_png(self) -> Optional[bytes]:
+        """PNG bytes of the cached spectrogram, encoded once per generated image."""
+        if self._last_spectrogram_png is None and self._last_spectrogram_image is not None:
+            buffer = QBuffer()
+            if buffer.open(QIODevice.WriteOnly) and self._last_spectrogram_image.save(buffer, "PNG"):
+                self._last_spectrogram_png = bytes(buffer.data())
+        return self._last_spectrogram_png
 
     def _on_analysis_complete(self, text: str) -> None:
         QMessageBox.information(self, "Spectrogram Analysis", text)
@@ -450,28 +690,30 @@ class MusicApp(QWidget):
         if " " in name:
             self._show_error("Take names should not contain spaces.")
             return
-        try:
-            if not self.bridge.save_current(name):
+
+        def _on_saved(saved: bool) -> None:
+            if not saved:
                 self._show_error("Could not save current take. Ensure a recording exists and the name is unique.")
                 return
             self._set_status(f"Saved take '{name}'.")
             self.name_input.clear()
             self._refresh_metadata()
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+
+        self._run_bridge(self.save_button, self.bridge.save_current, name, on_result=_on_saved)
 
     def _handle_set_current(self) -> None:
         selected = self._selected_take_name()
         if not selected:
             return
-        try:
-            if not self.bridge.set_as_current(selected):
+
+        def _on_set(updated: bool) -> None:
+            if not updated:
                 self._show_error("Failed to set selected take as current.")
                 return
             self._set_status(f"Set '{selected}' as current take.")
             self._refresh_metadata()
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+
+        self._run_bridge(self.set_curr_button, self.bridge.set_as_current, selected, on_result=_on_set)
 
     def _handle_delete_take(self) -> None:
         selected = self._selected_take_name()
@@ -485,68 +727,113 @@ class MusicApp(QWidget):
         )
         if confirm != QMessageBox.Yes:
             return
-        try:
-            if not self.bridge.delete_take(selected):
+
+        def _on_deleted(deleted: bool) -> None:
+            if not deleted:
                 self._show_error("Failed to delete the selected take.")
                 return
             self._set_status(f"Deleted '{selected}'.")
             self._refresh_metadata()
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+
+        self._run_bridge(self.delete_button, self.bridge.delete_take, selected, on_result=_on_deleted)
 
     def _selected_take_name(self) -> Optional[str]:
-        indexes = self.table.selectionModel().selectedRows()
+        indexes = self._selection_model.selectedRows()
         if not indexes:
             return None
-        row = indexes[0].row()
-        item = self.table.item(row, 0)
-        return item.text() if item else None
+        return self.recordings_model.row_name(indexes[0].row())
 
     def _refresh_metadata(self) -> None:
+        """Fetch metadata off the GUI thread, one fetch at a time.
+
+        A refresh asked for while one is in flight is coalesced into a single
+        follow-up fetch, so results always arrive in request order.
+        """
+        if self._refresh_in_flight:
+            self._refresh_pending = True
+            return
+        self._refresh_in_flight = True
+        self._run_bridge(
+            self.refresh_button,
+            self.bridge.fetch_recordings_and_current,
+            on_result=self._on_metadata_fetched,
+            on_error=self._on_metadata_failed,
+        )
+
+    def _on_metadata_fetched(self, fetched: tuple[dict[str, dict], Optional[str]]) -> None:
         try:
-            recordings_map = self.bridge.fetch_recordings()
-            curr = recordings_map.get("curr")
-            self.curr_metadata = None
-            self.curr_path = None
-            if isinstance(curr, dict):
-                self.curr_metadata = RecordingMetadata(
-                    name="curr",
-                    size_bytes=int(curr.get("size", 0)),
-                    duration_seconds=float(curr.get("time", 0.0)),
-                )
-                raw_path = curr.get("path")
-                if raw_path:
-                    self.curr_path = str(raw_path)
-            if not self.curr_path:
-                try:
-                    self.curr_path = self.bridge.fetch_current_path()
-                except MCPBridgeError:
-                    self.curr_path = None
-            saved: list[RecordingMetadata] = []
-            for name, meta in recordings_map.items():
-                if name == "curr" or not isinstance(meta, dict):
-                    continue
-                saved.append(
-                    RecordingMetadata(
-                        name=name,
-                        size_bytes=int(meta.get("size", 0)),
-                        duration_seconds=float(meta.get("time", 0.0)),
-                    )
+            self._apply_metadata(fetched)
+        finally:
+            self._refresh_done()
+
+    def _on_metadata_failed(self, message: str) -> None:
+        try:
+            self._show_error(message)
+        finally:
+            self._refresh_done()
+
+    def _refresh_done(self) -> None:
+        self._refresh_in_flight = False
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self._refresh_metadata()
+
+    def _apply_metadata(self, fetched: tuple[dict[str, dict], Optional[str]]) -> None:
+        recordings_map, served_path = fetched
+        curr = recordings_map.get("curr")
+        self.curr_metadata = None
+        self.curr_path = None
+        if isinstance(curr, dict):
+            self.curr_metadata = RecordingMetadata(
+                name="curr",
+                size_bytes=int(curr.get("size", 0)),
+                duration_seconds=float(curr.get("time", 0.0)),
+            )
+            raw_path = curr.get("path")
+            if raw_path:
+                self.curr_path = str(raw_path)
+        if not self.curr_path:
+            self.curr_path = served_path
+        saved: list[RecordingMetadata] = []
+        for name, meta in recordings_map.items():
+            if name == "curr" or not isinstance(meta, dict):
+                continue
+            saved.append(
+                RecordingMetadata(
+                    name=name,
+                    size_bytes=int(meta.get("size", 0)),
+                    duration_seconds=float(meta.get("time", 0.0)),
                 )
-            self.recordings = sorted(saved, key=lambda m: m.name.lower())
-            self._populate_table()
-            self._update_current_labels()
-            self._update_selection_state()
-        except MCPBridgeError as exc:
-            self._show_error(str(exc))
+            )
+        self.recordings = sorted(saved, key=lambda m: m.name.lower())
+        self._populate_table()
+        self._update_current_labels()
+        self._update_selection_state()
 
     def _populate_table(self) -> None:
-        self.table.setRowCount(len(self.recordings))
-        for row, meta in enumerate(self.recordings):
-            self.table.setItem(row, 0, QTableWidgetItem(meta.name))
-            self.table.setItem(row, 1, QTableWidgetItem(meta.formatted_size()))
-            self.table.setItem(row, 2, QTableWidgetItem(meta.formatted_duration()))
-        self.table.resizeRowsToContents()
+        snapshot = [(m.name, m.size_bytes, m.duration_seconds) for m in self.recordings]
+        if snapshot == self._last_recordings_snapshot:
+            return
+        selected = self._selected_take_name()
+        selection_model = self._selection_model
+        # A model reset drops the selection; restore it by name without
+        # emitting an intermediate "nothing selected" change, and repaint once
+        # for the reset and the reselect together.
+        self.table.setUpdatesEnabled(False)
+        selection_model.blockSignals(True)
+        try:
+            self.recordings_model.set_rows(self.recordings)
+            row = self.recordings_model.row_of(selected) if selected else -1
+            if row >= 0:
+                selection_model.select(
+                    self.recordings_model.index(row, 0),
+                    QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows,
+                )
+        finally:
+            selection_model.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+        self._viewport.update()
+        self._last_recordings_snapshot = snapshot
 
     def _update_current_labels(self) -> None:
         if self.curr_metadata:
@@ -570,6 +857,12 @@ class MusicApp(QWidget):
 
 
 def run() -> None:
+    try:
+        import uvloop
+    except ImportError:  # pragma: no cover - optional speedup, unavailable on Windows
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     app = QApplication([])
     window = MusicApp()
     window.resize(640, 480)
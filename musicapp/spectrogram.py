@@ -1,11 +1,14 @@
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QPixmap
+from scipy import fft as scipy_fft
 from scipy.io import wavfile
-from scipy.signal import spectrogram as scipy_spectrogram
 
 try:
     from .mcp_bridge import MCPBridge, MCPBridgeError
@@ -30,12 +33,38 @@ NOTE_FREQUENCIES = [
 ]
 
 
+def _build_gradient_lut() -> np.ndarray:
+    """Precompute the low -> mid -> high colour ramp for all 256 intensity levels."""
+    low_rgb = np.array([13, 17, 23], dtype=np.float32)
+    mid_rgb = np.array([59, 130, 246], dtype=np.float32)
+    high_rgb = np.array([254, 240, 138], dtype=np.float32)
+    ratio = np.linspace(0.0, 2.0, 256, dtype=np.float32)[:, None]
+    ramp = np.where(
+        ratio <= 1.0,
+        low_rgb + ratio * (mid_rgb - low_rgb),
+        mid_rgb + (ratio - 1.0) * (high_rgb - mid_rgb),
+    )
+    return np.clip(ramp, 0, 255).astype(np.uint8)
+
+
+GRADIENT_LUT = _build_gradient_lut()
+
+
 @dataclass
 class SpectrogramAssets:
-    pixmap: QPixmap
     image: QImage
     title: str
 
+    @property
+    def pixmap(self) -> QPixmap:
+        """Pixmap for display. QPixmap is GUI-thread only, so build it there on demand."""
+        return QPixmap.fromImage(self.image)
+
+
+_SPECTROGRAM_CACHE_SIZE = 8
+_spectrogram_cache: OrderedDict[tuple[str, int, int], SpectrogramAssets] = OrderedDict()
+_spectrogram_cache_lock = threading.Lock()
+
 
 def resolve_audio_path(
     curr_path: str | None,
@@ -59,9 +88,40 @@ def resolve_audio_path(
     raise SpectrogramError("Current take path is unavailable. Refresh metadata and try again.")
 
 
+def audio_cache_key(audio_path: Path) -> tuple[str, int, int] | None:
+    """Identify the current contents of ``audio_path`` by resolved path, mtime and size."""
+    try:
+        stat = audio_path.stat()
+    except OSError:
+        return None
+    return (str(audio_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
 def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
-    """Compute and render a spectrogram image for the given audio file."""
+    """Compute and render a spectrogram image for the given audio file.
+
+    Renders are cached by path, mtime and size, so an unchanged file is only
+    processed once. Only touches QImage and QPainter, so it is safe to call
+    from a worker thread.
+    """
     audio_path = audio_path.resolve()
+    key = audio_cache_key(audio_path)
+    if key is not None:
+        with _spectrogram_cache_lock:
+            cached = _spectrogram_cache.get(key)
+            if cached is not None:
+                _spectrogram_cache.move_to_end(key)
+                return cached
+    assets = _render_spectrogram(audio_path)
+    if key is not None:
+        with _spectrogram_cache_lock:
+            _spectrogram_cache[key] = assets
+            while len(_spectrogram_cache) > _SPECTROGRAM_CACHE_SIZE:
+                _spectrogram_cache.popitem(last=False)
+    return assets
+
+
+def _render_spectrogram(audio_path: Path) -> SpectrogramAssets:
     try:
         sample_rate, data = wavfile.read(str(audio_path))
     except Exception as exc:  # pylint: disable=broad-except
@@ -76,15 +136,7 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
     nperseg = int(min(4096, len(data)))
     noverlap = int(min(nperseg - 1, max(0, int(nperseg * 0.9))))
     try:
-        freqs, times, power = scipy_spectrogram(
-            data,
-            fs=sample_rate,
-            window="hann",
-            nperseg=nperseg,
-            noverlap=noverlap,
-            scaling="spectrum",
-            mode="magnitude",
-        )
+        freqs, times, power = _magnitude_spectrogram(data, sample_rate, nperseg, noverlap)
     except Exception as exc:  # pylint: disable=broad-except
         raise SpectrogramError(f"Could not compute spectrogram: {exc}") from exc
     if power.size == 0 or times.size == 0 or freqs.size == 0:
@@ -108,37 +160,15 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
     freqs = log_freqs
     power = power_log
 
-    power = np.maximum(power, 1e-12)
-    power_db = 10 * np.log10(power)
-    finite_mask = np.isfinite(power_db)
-    if not finite_mask.any():
-        raise SpectrogramError("Spectrogram contains no finite values.")
-    finite_values = power_db[finite_mask]
-    min_val = float(finite_values.min())
-    max_val = float(finite_values.max())
-    if np.isclose(max_val, min_val):
-        normalized = np.zeros_like(power_db)
-    else:
-        normalized = (power_db - min_val) / (max_val - min_val)
-    normalized = np.clip(normalized, 0.0, 1.0)
-    flipped = normalized[::-1]
-
-    height, width = flipped.shape
-    low_rgb = np.array([13, 17, 23], dtype=np.float32)
-    mid_rgb = np.array([59, 130, 246], dtype=np.float32)
-    high_rgb = np.array([254, 240, 138], dtype=np.float32)
-    colorized = np.empty((height, width, 3), dtype=np.float32)
-    lower_mask = flipped <= 0.5
-    if lower_mask.any():
-        lower_ratio = (flipped[lower_mask] * 2.0).reshape(-1, 1)
-        colorized[lower_mask] = low_rgb + lower_ratio * (mid_rgb - low_rgb)
-    if (~lower_mask).any():
-        upper_ratio = ((flipped[~lower_mask] - 0.5) * 2.0).reshape(-1, 1)
-        colorized[~lower_mask] = mid_rgb + upper_ratio * (high_rgb - mid_rgb)
-    colorized = np.clip(colorized, 0, 255).astype(np.uint8)
-    buffer = np.ascontiguousarray(colorized)
-    bytes_per_line = buffer.shape[1] * 3
-    base_image = QImage(buffer.tobytes(), width, height, bytes_per_line, QImage.Format_RGB888).copy()
+    levels = _db_levels(power)
+    height, width = levels.shape
+    # Fancy indexing always allocates a fresh C-contiguous array, even through
+    # the flipped view, so it can back the QImage as is.
+    colorized = GRADIENT_LUT[levels[::-1]]
+    assert colorized.flags["C_CONTIGUOUS"]
+    bytes_per_line = width * 3
+    # Wraps ``colorized`` without copying; it stays alive until drawn onto the canvas below.
+    base_image = QImage(colorized.data, width, height, bytes_per_line, QImage.Format_RGB888)
 
     left_margin, right_margin = 110, 20
     top_margin, bottom_margin = 20, 60
@@ -164,6 +194,11 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
     tick_font.setPointSize(9)
     painter.setFont(tick_font)
 
+    # Collect every tick and label first so each pen is set once for the
+    # whole pass instead of toggling between the two for every tick.
+    tick_lines: list[tuple[int, int, int, int]] = []
+    tick_labels: list[tuple[int, int, int, int, int, str]] = []
+
     if times.size:
         denom = max(1, times.size - 1)
         tick_count = min(6, times.size)
@@ -173,11 +208,9 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
             ratio = idx / denom if denom else 0
             x_offset = int(round(ratio * width)) if width > 1 else 0
             x = left_margin + min(width, max(0, x_offset))
-            painter.setPen(tick_pen)
-            painter.drawLine(x, bottom_y, x, bottom_y + 6)
+            tick_lines.append((x, bottom_y, x, bottom_y + 6))
             label = f"{times[idx]:.2f}s" if times[idx] < 10 else f"{times[idx]:.1f}s"
-            painter.setPen(text_pen)
-            painter.drawText(x - 25, bottom_y + 24, 50, 16, Qt.AlignHCenter, label)
+            tick_labels.append((x - 25, bottom_y + 24, 50, 16, Qt.AlignHCenter, label))
 
     if freqs.size:
         log_min = np.log(freq_min)
@@ -192,16 +225,16 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
                 ratio = (np.log(freq_val) - log_min) / (log_max - log_min) if log_max > log_min else 0.0
                 y_offset = int(round((1 - ratio) * (height - 1))) if height > 1 else 0
                 y = top_margin + min(height, max(0, y_offset))
-                painter.setPen(tick_pen)
-                painter.drawLine(left_margin - 6, y, left_margin, y)
-                painter.setPen(text_pen)
-                painter.drawText(
-                    5,
-                    y - 8,
-                    left_margin - 12,
-                    16,
-                    Qt.AlignRight | Qt.AlignVCenter,
-                    f"{label} ({freq_val:.1f} Hz)",
+                tick_lines.append((left_margin - 6, y, left_margin, y))
+                tick_labels.append(
+                    (
+                        5,
+                        y - 8,
+                        left_margin - 12,
+                        16,
+                        Qt.AlignRight | Qt.AlignVCenter,
+                        f"{label} ({freq_val:.1f} Hz)",
+                    )
                 )
         else:
             max_freq = float(freqs[-1]) if freqs[-1] else 1.0
@@ -213,18 +246,25 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
                 ratio = (np.log(freq_val) - np.log(freqs[0])) / (np.log(max_freq) - np.log(freqs[0])) if max_freq > freqs[0] else 0.0
                 y_offset = int(round((1 - ratio) * (height - 1))) if height > 1 else 0
                 y = top_margin + min(height, max(0, y_offset))
-                painter.setPen(tick_pen)
-                painter.drawLine(left_margin - 6, y, left_margin, y)
-                label = _format_frequency(freq_val)
-                painter.setPen(text_pen)
-                painter.drawText(
-                    5,
-                    y - 8,
-                    left_margin - 12,
-                    16,
-                    Qt.AlignRight | Qt.AlignVCenter,
-                    label,
+                tick_lines.append((left_margin - 6, y, left_margin, y))
+                tick_labels.append(
+                    (
+                        5,
+                        y - 8,
+                        left_margin - 12,
+                        16,
+                        Qt.AlignRight | Qt.AlignVCenter,
+                        _format_frequency(freq_val),
+                    )
                 )
+
+    painter.setPen(tick_pen)
+    for line in tick_lines:
+        painter.drawLine(*line)
+    painter.setPen(text_pen)
+    for text in tick_labels:
+        painter.drawText(*text)
+
     axis_font = QFont()
     axis_font.setPointSize(10)
     axis_font.setBold(True)
@@ -254,10 +294,63 @@ def generate_spectrogram(audio_path: Path) -> SpectrogramAssets:
     painter.end()
 
     title = f"Spectrogram - {audio_path.name}"
-    pixmap = QPixmap.fromImage(canvas)
-    return SpectrogramAssets(pixmap=pixmap, image=canvas, title=title)
+    return SpectrogramAssets(image=canvas, title=title)
+
+
+def _db_levels(power: np.ndarray) -> np.ndarray:
+    """Convert magnitudes to dB and min-max normalise them to 0..255 gradient levels.
+
+    Works in place on ``power``, which is overwritten, so each step is one pass
+    with no full-size float temporaries.
+    """
+    power_db = np.maximum(power, 1e-12, out=power)
+    np.log10(power_db, out=power_db)
+    power_db *= 10
+    finite_mask = np.isfinite(power_db)
+    if finite_mask.all():
+        min_val = float(power_db.min())
+        max_val = float(power_db.max())
+    else:
+        if not finite_mask.any():
+            raise SpectrogramError("Spectrogram contains no finite values.")
+        finite_values = power_db[finite_mask]
+        min_val = float(finite_values.min())
+        max_val = float(finite_values.max())
+    if np.isclose(max_val, min_val):
+        return np.zeros(power_db.shape, dtype=np.uint8)
+    power_db -= min_val
+    power_db *= 255.0 / (max_val - min_val)
+    np.clip(power_db, 0.0, 255.0, out=power_db)
+    np.rint(power_db, out=power_db)
+    return power_db.astype(np.uint8)
+
+
+@lru_cache(maxsize=8)
+def _hann_window(nperseg: int) -> np.ndarray:
+    # Periodic Hann, as used by scipy.signal.get_window("hann", nperseg).
+    return np.hanning(nperseg + 1)[:-1].astype(np.float32)
+
+
+def _magnitude_spectrogram(
+    data: np.ndarray, sample_rate: int, nperseg: int, noverlap: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Equivalent of ``scipy.signal.spectrogram(..., window="hann", scaling="spectrum",
+    mode="magnitude")`` specialised to the parameters used here."""
+    step = nperseg - noverlap
+    frames = np.lib.stride_tricks.sliding_window_view(data, nperseg)[::step]
+    # Constant detrend per segment, then window.
+    segments = frames - frames.mean(axis=-1, keepdims=True)
+    window = _hann_window(nperseg)
+    segments *= window
+    spectrum = scipy_fft.rfft(segments, axis=-1, workers=-1)
+    power = np.abs(spectrum).astype(np.float32, copy=False).T
+    power /= window.sum()
+    freqs = scipy_fft.rfftfreq(nperseg, 1.0 / sample_rate)
+    times = (np.arange(len(frames)) * step + nperseg / 2) / sample_rate
+    return freqs, times, power
 
 
+@lru_cache(maxsize=256)
 def _format_frequency(freq: float) -> str:
     if freq >= 1000:
         return f"{freq / 1000:.1f} kHz"
@@ -1,22 +1,47 @@
-import base64
+import asyncio
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-from PyQt5.QtCore import QBuffer, QIODevice
+from PyQt5.QtCore import QBuffer, QIODevice, Qt
 from PyQt5.QtGui import QImage
 
-try:
-    from openai import OpenAI
-except ImportError as exc:  # pragma: no cover - dependency runtime check
-    OpenAI = None  # type: ignore
-    _import_error = exc
-else:
-    _import_error = None
+if TYPE_CHECKING:
+    import openai
 
 PROMPT = (
     "This spectrogram was created from a recording of a piece of music. If possible, please identify the sequence of notes played and the instrument used."
 )
 
+BATCH_PROMPT = (
+    "Each of the following {count} spectrograms was created from a recording of a piece of music. "
+    "For each one, if possible, identify the sequence of notes played and the instrument used. "
+    'Respond only with a JSON array of objects of the form {{"index": <spectrogram number>, "analysis": "<text>"}}, '
+    "one per spectrogram."
+)
+
+_UPLOAD_CACHE_SIZE = 16
+# Uploads expire server-side in case close() never runs; a cached id stops
+# being reused an hour before that so it can't vanish mid-request.
+_UPLOAD_EXPIRY = {"anchor": "created_at", "seconds": 24 * 3600}
+_UPLOAD_REUSE_SECONDS = _UPLOAD_EXPIRY["seconds"] - 3600
+_JPEG_QUALITY = 85
+_UPLOAD_MAX_WIDTH = 1024
+# (image cache key, api_key) -> (file_id, monotonic time until which it is reused)
+_uploaded_files: OrderedDict[tuple[int, str], tuple[str, float]] = OrderedDict()
+# (api_key, file_id) pairs dropped from _uploaded_files, deleted once no
+# analysis that may still reference them is running
+_evicted_files: list[tuple[str, str]] = []
+_active_analyses = 0
+_uploads_lock = threading.Lock()  # guards the three above
+_clients: dict[str, "openai.OpenAI"] = {}
+_clients_lock = threading.Lock()
+
 
 class SpectrogramAnalysisError(RuntimeError):
     """Raised when spectrogram analysis fails."""
@@ -28,37 +53,209 @@ class AnalysisResult:
 
 
 def analyze_spectrogram(image: QImage, api_key: str | None = None) -> AnalysisResult:
-    if OpenAI is None:  # pragma: no cover
+    client = _client(_require_api_key(api_key))
+    _begin_analysis()
+    try:
+        text = _request_text(
+            client,
+            [
+                {"type": "input_text", "text": PROMPT},
+                {"type": "input_image", "file_id": _upload_image(client, image)},
+            ],
+        )
+    finally:
+        _delete_files(_end_analysis())
+    return AnalysisResult(text=text.strip())
+
+
+def analyze_spectrograms(images: list[QImage], api_key: str | None = None) -> list[AnalysisResult]:
+    """Analyse several spectrograms with a single request, one result per image."""
+    if len(images) <= 1:
+        return [analyze_spectrogram(image, api_key) for image in images]
+    client = _client(_require_api_key(api_key))
+    content: list[dict] = [
+        {"type": "input_text", "text": BATCH_PROMPT.format(count=len(images))}
+    ]
+    _begin_analysis()
+    try:
+        for index, image in enumerate(images, start=1):
+            content.append({"type": "input_text", "text": f"Spectrogram {index}:"})
+            content.append({"type": "input_image", "file_id": _upload_image(client, image)})
+        text = _request_text(client, content)
+    finally:
+        _delete_files(_end_analysis())
+    return _split_batch_results(text, len(images))
+
+
+def analyze_many(
+    images: list[QImage],
+    api_key: str | None = None,
+    max_concurrent: int = 10,
+    rpm: int = 500,
+    max_attempts: int = 5,
+) -> list[AnalysisResult]:
+    """Analyse spectrograms with concurrent requests, one result per image.
+
+    At most ``max_concurrent`` requests are in flight and request starts are
+    spaced to stay under ``rpm``. Rate-limited requests are retried with
+    exponential backoff up to ``max_attempts`` times.
+    """
+    key = _require_api_key(api_key)
+    _begin_analysis()
+    try:
+        uploads: list[tuple[tuple[int, str], str | bytes]] = []
+        for image in images:
+            cache_key = (image.cacheKey(), key)
+            uploads.append((cache_key, _cached_upload(cache_key) or _encode_image(image)))
+        return asyncio.run(_analyze_many(uploads, key, max_concurrent, rpm, max_attempts))
+    finally:
+        _delete_files(_end_analysis())
+
+
+def close() -> None:
+    """Delete every spectrogram this process uploaded and close the pooled clients.
+
+    Call once no analysis is running, e.g. when the application exits.
+    """
+    with _uploads_lock:
+        files = [(key, file_id) for (_, key), (file_id, _) in _uploaded_files.items()]
+        files += _evicted_files
+        _uploaded_files.clear()
+        _evicted_files.clear()
+    _delete_files(files)
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def _analyze_many(
+    uploads: list[tuple[tuple[int, str], str | bytes]],
+    key: str,
+    max_concurrent: int,
+    rpm: int,
+    max_attempts: int,
+) -> list[AnalysisResult]:
+    semaphore = asyncio.Semaphore(max_concurrent)
+    throttle = _RequestThrottle(rpm)
+    openai_module = _openai()
+    async with openai_module.AsyncOpenAI(api_key=key) as client:
+
+        async def _analyze(cache_key: tuple[int, str], source: str | bytes) -> AnalysisResult:
+            async with semaphore:
+                if isinstance(source, str):
+                    file_id = source
+                else:
+                    try:
+                        uploaded = await client.files.create(
+                            file=_image_file(source), purpose="vision", expires_after=_UPLOAD_EXPIRY
+                        )
+                    except Exception as exc:  # pragma: no cover
+                        raise SpectrogramAnalysisError(f"Failed to upload spectrogram image: {exc}") from exc
+                    file_id = _remember_upload(cache_key, uploaded.id)
+                content = [
+                    {"type": "input_text", "text": PROMPT},
+                    {"type": "input_image", "file_id": file_id},
+                ]
+                for attempt in range(max(1, max_attempts)):
+                    await throttle.wait()
+                    try:
+                        response = await client.responses.create(
+                            model="gpt-5",
+                            input=[{"role": "user", "content": content}],
+                        )
+                    except openai_module.RateLimitError as exc:
+                        if attempt + 1 >= max_attempts:
+                            raise SpectrogramAnalysisError(f"OpenAI API request failed: {exc}") from exc
+                        await asyncio.sleep(_retry_delay(exc, attempt))
+                    except Exception as exc:  # pragma: no cover
+                        raise SpectrogramAnalysisError(f"OpenAI API request failed: {exc}") from exc
+                    else:
+                        break
+            text = _extract_text(response)
+            if not text:
+                raise SpectrogramAnalysisError("OpenAI response did not contain any text output.")
+            return AnalysisResult(text=text.strip())
+
+        return list(await asyncio.gather(*(_analyze(*upload) for upload in uploads)))
+
+
+class _RequestThrottle:
+    """Space request starts evenly so no more than ``rpm`` begin per minute."""
+
+    def __init__(self, rpm: int) -> None:
+        self._interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = max(self._next_start, loop.time()) + self._interval
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return float(2**attempt)
+
+
+def _openai() -> ModuleType:
+    """Import the openai package on first use so loading this module stays cheap."""
+    try:
+        import openai
+    except ImportError as exc:  # pragma: no cover - dependency runtime check
         raise SpectrogramAnalysisError(
             "openai package is not installed. Install it with 'pip install openai'."
-        ) from _import_error
+        ) from exc
+    return openai
+
+
+def _client(api_key: str) -> "openai.OpenAI":
+    """Return a client for ``api_key`` that keeps its connection pool between calls.
+
+    Follow-up analyses then reuse the open TLS connection to the API instead of
+    paying for a fresh handshake each time.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            openai_module = _openai()
+            import httpx  # installed alongside openai
+
+            client = openai_module.OpenAI(
+                api_key=api_key,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+                    timeout=60,
+                ),
+            )
+            _clients[api_key] = client
+        return client
+
 
+def _require_api_key(api_key: str | None) -> str:
+    _openai()
     key = api_key or os.getenv("OPENAI_API_KEY")
     if not key:
         raise SpectrogramAnalysisError("OPENAI_API_KEY environment variable is not set.")
+    return key
 
-    buffer = QBuffer()
-    if not buffer.open(QIODevice.WriteOnly):
-        raise SpectrogramAnalysisError("Failed to initialise image buffer.")
-    if not image.save(buffer, "PNG"):
-        raise SpectrogramAnalysisError("Failed to encode spectrogram image.")
-    image_bytes = bytes(buffer.data())
-    image_b64 = base64.b64encode(image_bytes).decode("ascii")
-    data_url = f"data:image/png;base64,{image_b64}"
 
-    client = OpenAI(api_key=key)
+def _request_text(client: "openai.OpenAI", content: list[dict]) -> str:
     try:
         response = client.responses.create(
             model="gpt-5",
-            input=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "input_text", "text": PROMPT},
-                        {"type": "input_image", "image_url": data_url},
-                    ],
-                }
-            ],
+            input=[{"role": "user", "content": content}],
         )
     except Exception as exc:  # pragma: no cover
         raise SpectrogramAnalysisError(f"OpenAI API request failed: {exc}") from exc
@@ -66,7 +263,116 @@ def analyze_spectrogram(image: QImage, api_key: str | None = None) -> AnalysisRe
     text = _extract_text(response)
     if not text:
         raise SpectrogramAnalysisError("OpenAI response did not contain any text output.")
-    return AnalysisResult(text=text.strip())
+    return text
+
+
+def _split_batch_results(text: str, count: int) -> list[AnalysisResult]:
+    body = text.strip()
+    if body.startswith("```"):
+        body = body.strip("`").removeprefix("json").strip()
+    try:
+        entries = json.loads(body)
+    except json.JSONDecodeError as exc:
+        raise SpectrogramAnalysisError(f"Could not parse batched analysis response: {exc}") from exc
+    by_index: dict[int, str] = {}
+    if isinstance(entries, list):
+        for entry in entries:
+            if isinstance(entry, dict) and "index" in entry:
+                try:
+                    by_index[int(entry["index"])] = str(entry.get("analysis", "")).strip()
+                except (TypeError, ValueError):
+                    continue
+    missing = [index for index in range(1, count + 1) if not by_index.get(index)]
+    if missing:
+        raise SpectrogramAnalysisError(
+            f"Batched analysis response is missing spectrogram(s) {missing}."
+        )
+    return [AnalysisResult(text=by_index[index]) for index in range(1, count + 1)]
+
+
+def _upload_image(client: "openai.OpenAI", image: QImage) -> str:
+    """Upload ``image`` as a JPEG file, reusing the file id for the same image and key."""
+    cache_key = (image.cacheKey(), client.api_key)
+    file_id = _cached_upload(cache_key)
+    if file_id is not None:
+        return file_id
+    try:
+        uploaded = client.files.create(
+            file=_image_file(_encode_image(image)), purpose="vision", expires_after=_UPLOAD_EXPIRY
+        )
+    except Exception as exc:  # pragma: no cover
+        raise SpectrogramAnalysisError(f"Failed to upload spectrogram image: {exc}") from exc
+    return _remember_upload(cache_key, uploaded.id)
+
+
+def _cached_upload(cache_key: tuple[int, str]) -> str | None:
+    with _uploads_lock:
+        entry = _uploaded_files.get(cache_key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():  # about to expire server-side
+            del _uploaded_files[cache_key]
+            _evicted_files.append((cache_key[1], entry[0]))
+            return None
+        _uploaded_files.move_to_end(cache_key)
+        return entry[0]
+
+
+def _remember_upload(cache_key: tuple[int, str], file_id: str) -> str:
+    with _uploads_lock:
+        _uploaded_files[cache_key] = (file_id, time.monotonic() + _UPLOAD_REUSE_SECONDS)
+        if len(_uploaded_files) > _UPLOAD_CACHE_SIZE:
+            (_, api_key), (evicted, _) = _uploaded_files.popitem(last=False)
+            _evicted_files.append((api_key, evicted))
+    return file_id
+
+
+def _begin_analysis() -> None:
+    global _active_analyses
+    with _uploads_lock:
+        _active_analyses += 1
+
+
+def _end_analysis() -> list[tuple[str, str]]:
+    """Finish an analysis, returning the evicted uploads that are now safe to delete.
+
+    Another thread may still be sending an id this one evicted, so nothing is
+    handed out until the last running analysis finishes.
+    """
+    global _active_analyses
+    with _uploads_lock:
+        _active_analyses -= 1
+        if _active_analyses:
+            return []
+        files = list(_evicted_files)
+        _evicted_files.clear()
+        return files
+
+
+def _delete_files(files: list[tuple[str, str]]) -> None:
+    """Delete ``(api_key, file_id)`` uploads so they don't pile up in the account."""
+    for api_key, file_id in files:
+        try:
+            _client(api_key).files.delete(file_id)
+        except Exception:  # pragma: no cover
+            pass  # best effort; the upload still expires server-side
+
+
+def _encode_image(image: QImage) -> bytes:
+    # The vision model downsamples large inputs anyway, so send a lossy,
+    # width-capped copy; it is a fraction of the PNG's size and encode time.
+    if image.width() > _UPLOAD_MAX_WIDTH:
+        image = image.scaledToWidth(_UPLOAD_MAX_WIDTH, Qt.SmoothTransformation)
+    buffer = QBuffer()
+    if not buffer.open(QIODevice.WriteOnly):
+        raise SpectrogramAnalysisError("Failed to initialise image buffer.")
+    if not image.save(buffer, "JPEG", _JPEG_QUALITY):
+        raise SpectrogramAnalysisError("Failed to encode spectrogram image.")
+    return bytes(buffer.data())
+
+
+def _image_file(data: bytes) -> tuple[str, bytes, str]:
+    return ("spectrogram.jpg", data, "image/jpeg")
 
 
 def _extract_text(response: object) -> str:
@@ -1,137 +1,491 @@
 import os.path as path
 import os
+import json
+import math
+import mmap
 import shutil
+import struct
+import sys
+from array import array
 import pyaudio
 import threading
 import wave
+from time import monotonic, sleep
 import yaml
 import fastmcp
+try:
+    import orjson
+    dumps, loads = orjson.dumps, orjson.loads
+except ImportError:
+    dumps, loads = lambda obj: json.dumps(obj).encode(), json.loads
+# libyaml-backed safe loader/dumper when PyYAML was built with it
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+pa = pyaudio.PyAudio()
+
+def autoChunk():
+    # Power of two nearest the input device's low-latency buffer, in 256..4096
+    try:
+        latency = pa.get_default_input_device_info()["defaultLowInputLatency"]
+    except (OSError, KeyError): # no input device yet, keep the old default
+        return 1024
+    return 1 << round(math.log2(min(4096, max(256, latency * RATE))))
+
+def envChunk():
+    # MCP_AUDIO_CHUNK overrides autoChunk(), held to the same 256..4096 range
+    value = os.environ.get("MCP_AUDIO_CHUNK", "").strip()
+    if not value:
+        return autoChunk()
+    try:
+        chunk = int(value)
+    except ValueError:
+        chunk = 0
+    if chunk <= 0:
+        print(f"ignoring MCP_AUDIO_CHUNK={value!r}, not a positive integer", file=sys.stderr)
+        return autoChunk()
+    clamped = min(4096, max(256, chunk))
+    if clamped != chunk:
+        print(f"MCP_AUDIO_CHUNK={chunk} is outside 256..4096, using {clamped}", file=sys.stderr)
+    return clamped
 
-CHUNK = 1024
 RATE = 44100
+WIDTH = pa.get_sample_size(pyaudio.paInt16)
+CHUNK = envChunk() # frames per buffer
+SLOT = CHUNK * WIDTH # bytes in one mono chunk
+# Power of two so the ring index is a mask, holding at least 1.5 s of audio
+SLOTS = 1 << (-(-int(1.5 * RATE) // CHUNK) - 1).bit_length()
+WRITE_BUFFER = 1 << 20 # gathers the per-chunk writes into a few large ones
+HEADER_PROBE = 4096 # bytes read to find the fmt and data chunks
+RIFF_CHUNK = struct.Struct("<4sI")
+WAV_FMT = struct.Struct("<HHIIHH")
+# Canonical 44-byte PCM header with zero sizes; only offsets 4 and 40 change per take
+EMPTY_HEADER = struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36, b"WAVE", b"fmt ", 16, 1, 1,
+                           RATE, RATE * WIDTH, WIDTH, WIDTH * 8, b"data", 0)
+SIZE = struct.Struct("<I")
+SWAP = sys.byteorder == "big" # wav samples are little-endian
 PATH = path.dirname(path.abspath(__file__))
 SAVED = path.join(PATH, "recordings")
 CURR = path.join(PATH, "curr.wav")
+PART = CURR + ".part" # take being recorded, moved over curr.wav on stop
 TABLE = path.join(SAVED, "table.yaml")
+LOG = path.join(SAVED, "table.log") # changes made since table.yaml was written
+OLD_LOG = LOG + ".1" # rotated log, kept until the snapshot covering it is written
+SNAPSHOT_EVERY = 64 # logged changes before table.yaml is rewritten
+STOP_TIMEOUT = 1 # seconds playback may keep running after stopPlaying
+WORKER_TIMEOUT = 5 # seconds a start waits for the previous take to be finished
+FLUSH_DELAY = 0.1 # seconds a burst of changes has to coalesce before it is synced
+FLUSH_RETRY = 1 # seconds before a failed sync or snapshot is tried again
 mcp = fastmcp.FastMCP("MusicMCP")
-pa = pyaudio.PyAudio()
 recordStream = None
 playStream = None
-recordThread = None
-playThread = None
-recording = False
-playing = False
-lock = threading.Lock()
+IDLE, RECORDING, PLAYING = "idle", "recording", "playing"
+state = IDLE # only changed while holding cond
+worker = None # record/play thread, cleared once it has let go of its files
+cond = threading.Condition()
 table = None
+log = None
+logged = 0 # changes logged since the last snapshot
+pending = False # changes written to log but not yet synced
+failure = None # OSError from the last sync, until a sync succeeds again
+closing = False
+listing = None # serialized recordings() response, dropped whenever table changes
+flushed = threading.Condition() # guards table, log and the counters above
+flushThread = None
+ring = bytearray(SLOT * SLOTS)
+sizes = [0] * SLOTS
+head = 0 # chunks published by capture()
+tail = 0 # chunks drained by record()
+dropped = 0 # chunks capture() found no free slot for during this take
+captured = threading.Event() # set by capture() after publishing a chunk
+played = threading.Event() # set by playback() once it has sent its last buffer
+mapped = None # curr.wav mapped for playback()
+pos = 0 # next byte of mapped to play
+stopAt = 0 # end of the data chunk in mapped
 
 def start():
-    global recordStream, playStream, table
+    global recordStream, playStream, table, listing, log, closing, flushThread
     recordStream = pa.open(format=pyaudio.paInt16,
                     channels=1,
                     rate=RATE,
                     input=True,
-                    frames_per_buffer=CHUNK)
+                    frames_per_buffer=CHUNK,
+                    stream_callback=capture,
+                    start=False)
     playStream = pa.open(format=pyaudio.paInt16,
                     channels=1,
                     rate=RATE,
                     output=True,
-                    frames_per_buffer=CHUNK)
-    table = yaml.load(open(TABLE), yaml.Loader) or {}   
+                    frames_per_buffer=CHUNK,
+                    stream_callback=playback,
+                    start=False)
+    table = loadTable()
+    listing = None
+    if any(path.exists(f) and path.getsize(f) for f in (OLD_LOG, LOG)):
+        snapshot(table)
+    for f in (OLD_LOG, LOG):
+        if path.exists(f):
+            os.remove(f)
+    log = open(LOG, "ab")
+    closing = False
+    flushThread = threading.Thread(target=flusher, daemon=True)
+    flushThread.start()
 
 def stop():
+    global closing
+    with flushed:
+        closing = True
+        flushed.notify()
+    flushThread.join()
+    log.close()
+    snapshot(table)
+    for f in (OLD_LOG, LOG): # OLD_LOG is left behind by a failed snapshot
+        if path.exists(f):
+            os.remove(f)
     recordStream.stop_stream()
     recordStream.close()
     playStream.stop_stream()
     playStream.close()
     pa.terminate()
 
-def fileData(file):
-    wr = wave.open(file, "wr")  
-    time = wr.getnframes() / wr.getframerate()
-    wr.close()
-    return {"size" : path.getsize(CURR), "time" : time}
+def wavLayout(buf):
+    # Walk the RIFF chunks in buf for "fmt " and "data". Returns (frame size,
+    # rate, data offset, data length), or None if they are not within buf.
+    if buf[:4] != b"RIFF" or buf[8:12] != b"WAVE":
+        return None
+    pos, frameSize, rate = 12, 0, 0
+    while pos + 8 <= len(buf):
+        id, length = RIFF_CHUNK.unpack_from(buf, pos)
+        if id == b"fmt " and pos + 24 <= len(buf):
+            _, _, rate, _, frameSize, _ = WAV_FMT.unpack_from(buf, pos + 8)
+        elif id == b"data" and frameSize and rate:
+            return (frameSize, rate, pos + 8, length)
+        pos += 8 + length + (length & 1)
+    return None
+
+def wavMeta(file):
+    # One stat and one small read instead of having wave parse and validate
+    # the whole header.
+    size = os.stat(file).st_size
+    with open(file, "rb") as f:
+        layout = wavLayout(f.read(HEADER_PROBE))
+    if layout:
+        frameSize, rate, _, length = layout
+        return {"size" : size, "time" : length / frameSize / rate}
+    with wave.open(file, "rb") as wf: # unusual layout, let wave find the chunks
+        return {"size" : size, "time" : wf.getnframes() / wf.getframerate()}
+
+def fastcopy(src, dst):
+    # Copy in the kernel: copy_file_range can share extents on Btrfs/XFS and
+    # sendfile still skips the userspace buffers, picking up where it stopped.
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        size = os.fstat(s.fileno()).st_size
+        done = 0
+        try:
+            while done < size:
+                n = os.copy_file_range(s.fileno(), d.fileno(), size - done)
+                if not n:
+                    break
+                done += n
+        except (AttributeError, OSError):
+            try:
+                while done < size:
+                    n = os.sendfile(d.fileno(), s.fileno(), done, size - done)
+                    if not n:
+                        break
+                    done += n
+            except (AttributeError, OSError):
+                s.seek(done)
+                d.seek(done)
+                shutil.copyfileobj(s, d)
+
+def replaceCurr(src):
+    # Copy beside curr.wav and swap it in, so a playback still mapping the old
+    # file keeps its pages instead of faulting on a truncated one.
+    fastcopy(src, CURR + ".tmp")
+    os.replace(CURR + ".tmp", CURR)
+
+def loadTable():
+    with open(TABLE) as f:
+        loaded = yaml.load(f, Loader) or {}
+    for file in (OLD_LOG, LOG): # oldest first
+        if not path.exists(file):
+            continue
+        with open(file, "rb") as f:
+            for line in f:
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    break # torn final line from a crash
+                if entry["val"] is None:
+                    loaded.pop(entry["id"], None)
+                else:
+                    loaded[entry["id"]] = entry["val"]
+    return loaded
+
+def snapshot(snap):
+    # The replace is atomic, and replaying an older log over the new snapshot
+    # is harmless, so a crash at any point leaves a loadable table.
+    with open(TABLE + ".tmp", "w") as f:
+        yaml.dump(snap, f, Dumper)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(TABLE + ".tmp", TABLE)
+
+def flusher():
+    # Sync the log off the request path, once per burst of changes, and take
+    # snapshots from a copy so writeTable never waits on the YAML dump. Disk
+    # errors are reported and retried; only stop() ends this thread.
+    global log, logged, pending, failure
+    while True:
+        with flushed:
+            flushed.wait_for(lambda: pending or closing)
+            if closing and not pending:
+                return
+        sleep(FLUSH_DELAY)
+        try:
+            with flushed:
+                pending = False
+                log.flush()
+                synced = log
+            # Only this thread closes or rotates log, so the sync can run outside
+            # the lock and writeTable and recordings() never wait on the disk
+            os.fsync(synced.fileno())
+        except OSError as e:
+            with flushed:
+                pending = True # the changes are still unsynced, try them again
+                failure = e
+                print(f"table log sync failed: {e}", file=sys.stderr)
+                if closing: # stop() snapshots the whole table itself
+                    return
+                flushed.wait_for(lambda: closing, FLUSH_RETRY)
+            continue
+        try:
+            with flushed:
+                failure = None
+                if logged < SNAPSHOT_EVERY:
+                    continue
+                snap = dict(table)
+                logged = 0
+                # A failed snapshot leaves OLD_LOG as the only copy of its
+                # changes; keep appending to LOG until a snapshot covers both.
+                if not path.exists(OLD_LOG):
+                    log.close()
+                    try:
+                        os.replace(LOG, OLD_LOG)
+                    finally:
+                        log = open(LOG, "ab")
+            snapshot(snap)
+            os.remove(OLD_LOG)
+        except OSError as e:
+            print(f"table snapshot failed, retrying after {SNAPSHOT_EVERY} changes: {e}",
+                  file=sys.stderr)
 
 def writeTable(id, val):
-    if val == None:
-        if id == "curr":
-            wf = wave.open(CURR, "rb")   
-            table[id] = {"size" : path.getsize(CURR), "time" : wf.getnframes() / wf.getframerate()};   
-            wf.close()
-        else:
+    global logged, pending, listing
+    if val == None and id == "curr":
+        val = wavMeta(CURR)
+    with flushed:
+        if val == None:
             del table[id]
+        else:
+            table[id] = val
+        # Append just this change instead of re-dumping the whole table
+        log.write(dumps({"id" : id, "val" : val}) + b"\n")
+        logged += 1
+        pending = True
+        listing = None
+        flushed.notify()
+        if failure is not None: # the change is kept and retried, but not yet on disk
+            raise OSError(f"table log is not being saved: {failure}")
+
+def capture(data, frameCount, timeInfo, status):
+    # Runs on the PortAudio thread: copy into the next free slot and publish it.
+    # Only this callback moves head and only record() moves tail, so no lock is
+    # needed; a full ring drops the chunk rather than blocking the audio thread.
+    global head, dropped
+    if head - tail < SLOTS:
+        slot = head & (SLOTS - 1)
+        size = len(data)
+        if size > SLOT: # slice through a view so the copy is the only allocation
+            data, size = memoryview(data)[:SLOT], SLOT
+        ring[slot * SLOT : slot * SLOT + size] = data
+        sizes[slot] = size
+        head += 1
+        captured.set()
     else:
-        table[id] = val
-    yaml.dump(table, open(TABLE, "w"))
-
-def record():
-    frames = []
-    while recording:
-        data = recordStream.read(CHUNK)
-        frames.append(data)
-    with lock:
-        wf = wave.open(CURR, "wb")
-        wf.setnchannels(1)
-        wf.setsampwidth(pa.get_sample_size(pyaudio.paInt16))
-        wf.setframerate(RATE)
-        wf.writeframes(b"".join(frames))
-        wf.close()
-        writeTable("curr", None)
+        dropped += 1
+    return (None, pyaudio.paContinue)
+
+def wavHeader(dataSize):
+    header = bytearray(EMPTY_HEADER)
+    SIZE.pack_into(header, 4, 36 + dataSize)
+    SIZE.pack_into(header, 40, dataSize)
+    return header
+
+def openTake():
+    global head, tail, dropped
+    head = tail = dropped = 0
+    f = open(PART, "wb", buffering=WRITE_BUFFER)
+    f.write(EMPTY_HEADER) # sizes are patched once the take is finished
+    recordStream.start_stream()
+    return (f,)
+
+def record(f):
+    # Stream each chunk into the buffered file as it is drained, so memory stays
+    # bounded and stopping only has to flush what is left. The samples are
+    # already 16-bit PCM, so they go out as is rather than through wave.
+    global tail
+    view = memoryview(ring)
+    written = 0
+    try:
+        with f:
+            # After stopRecording flips the state, keep draining until the stream
+            # has delivered its last callback.
+            while state == RECORDING or tail != head or recordStream.is_active():
+                if tail == head:
+                    # Sleep until capture() publishes rather than polling; clearing
+                    # before the recheck means a chunk landing in between still wakes us
+                    captured.clear()
+                    if tail == head:
+                        captured.wait(CHUNK / RATE)
+                    continue
+                slot = tail & (SLOTS - 1)
+                data = view[slot * SLOT : slot * SLOT + sizes[slot]]
+                if SWAP:
+                    samples = array("h")
+                    samples.frombytes(data) # array("h", data) would take each byte as a sample
+                    samples.byteswap()
+                    data = samples
+                written += f.write(data)
+                tail += 1
+            f.seek(0)
+            f.write(wavHeader(written))
+        if dropped: # stdout carries the MCP protocol, so report on stderr
+            print(f"recording dropped {dropped} chunks: the ring was full", file=sys.stderr)
+        with cond:
+            os.replace(PART, CURR)
+            writeTable("curr", None)
+    finally:
+        if not recordStream.is_stopped(): # a failed write must not leave capture running
+            recordStream.stop_stream()
+        finish(RECORDING)
 
-def play():
-    global playing
-    with lock:
-        wf = wave.open(CURR, "rb")
-        data = wf.readframes(CHUNK)
-        while data and playing:
-            playStream.write(data)
-            data = wf.readframes(CHUNK)
-        playing = False
-        wf.close()
+def openPlayback():
+    # Map curr.wav so playback() just slices pages the kernel already caches.
+    # The whole file is mapped because mmap offsets must be page aligned.
+    global mapped, pos, stopAt
+    with open(CURR, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    layout = wavLayout(mm)
+    if layout is None:
+        mm.close()
+        raise ValueError(f"{CURR} has no PCM data chunk")
+    _, _, offset, length = layout
+    mapped, pos, stopAt = mm, offset, min(offset + length, len(mm))
+    played.clear()
+    playStream.start_stream()
+    return (mm,)
+
+def playback(data, frameCount, timeInfo, status):
+    # Runs on the PortAudio thread and reads the state with no lock, like
+    # capture(); stopPlaying takes effect on the next buffer.
+    global pos
+    chunk = mapped[pos : min(pos + frameCount * WIDTH, stopAt)]
+    pos += len(chunk)
+    if state != PLAYING or pos >= stopAt:
+        played.set()
+        return (chunk, pyaudio.paComplete)
+    return (chunk, pyaudio.paContinue)
+
+def play(mm):
+    try:
+        # playback() sets played, but don't rely on it alone: give up once the
+        # stream is no longer active (device error, abort) or has ignored a stop
+        # request for more than STOP_TIMEOUT.
+        stopSeen = None
+        while not played.wait(CHUNK / RATE) and playStream.is_active():
+            if state != PLAYING:
+                stopSeen = stopSeen or monotonic()
+                if monotonic() - stopSeen > STOP_TIMEOUT:
+                    break
+    finally:
+        if not playStream.is_stopped():
+            playStream.stop_stream()
+        mm.close()
+        finish(PLAYING)
+
+def begin(mode, target, prepare=None):
+    # IDLE -> mode, once the previous worker is done with its files. The
+    # condition is only held for the transition, never across audio I/O.
+    global state, worker
+    with cond:
+        # A worker only ever finishes a file here, so one that is still alive
+        # after the timeout is stuck and this start is refused.
+        if not cond.wait_for(lambda: state != IDLE or worker is None or not worker.is_alive(),
+                             WORKER_TIMEOUT):
+            return False
+        if state != IDLE:
+            return False
+        state = mode # before prepare() starts a stream whose callback checks it
+        try:
+            args = prepare() if prepare else ()
+        except BaseException:
+            state = IDLE
+            raise
+        worker = threading.Thread(target=target, args=args)
+        worker.start()
+        return True
+
+def end(mode):
+    # mode -> IDLE, returning the worker to join, or None if not in that mode
+    global state
+    with cond:
+        if state != mode:
+            return None
+        state = IDLE
+        return worker
+
+def finish(mode):
+    global state, worker
+    with cond:
+        if state == mode: # playback ran off the end of the file
+            state = IDLE
+        worker = None
+        cond.notify_all()
 
 @mcp.tool
 def startRecording() -> bool:
-    """Start recording.
+    """Start recording. Recording and playing are mutually exclusive.
     Returns True if successful, False otherwise"""
-    global recordThread, recording
-    if recording:
-        return False
-    recordThread = threading.Thread(target=record)
-    recording = True
-    recordThread.start()
-    return True
+    return begin(RECORDING, record, openTake)
     
 @mcp.tool
 def stopRecording() -> bool:
     """Stop recording and save the audio to curr.wav. May not be playing curr.wav at the same time.
     Returns True if successful, False otherwise."""
-    global recording
-    if not recording:
+    thread = end(RECORDING)
+    if thread is None:
         return False
-    recording = False
-    recordThread.join()
+    recordStream.stop_stream()
+    captured.set() # let record() see the stream has stopped
+    thread.join()
     return True
 
 @mcp.tool
 def startPlaying() -> bool:
-    """Start playing curr.wav.
+    """Start playing curr.wav. Recording and playing are mutually exclusive.
     Returns True if successful, False otherwise"""
-    global playThread, playing
-    if playing:
-        return False
-    playThread = threading.Thread(target=play)
-    playing = True
-    playThread.start()
-    return True
+    return begin(PLAYING, play, openPlayback)
 
 @mcp.tool
 def stopPlaying() -> bool:
     """Stop playing curr.wav.
     Returns True if play was interrupted, False if play had already stopped or otherwise."""
-    global playing
-    if not playing:
+    thread = end(PLAYING)
+    if thread is None:
         return False
-    playing = False
-    playThread.join()
+    thread.join()
     return True
 
 @mcp.tool
@@ -140,7 +494,7 @@ def saveCurr(name : str) -> bool:
     Returns True if successful, False otherwise"""
     if "curr" not in table or name in table:
         return False
-    shutil.copy(CURR, path.join(SAVED, name + ".wav"))
+    fastcopy(CURR, path.join(SAVED, name + ".wav"))
     writeTable(name, dict(table["curr"]))
     return True
     
@@ -149,14 +503,16 @@ def setAsCurr(name : str) -> bool:
     """If a full file path with a .wav extension is provided, the file is copied to curr.wav.
     If a file name is provided, the saved file with the given name is copied to curr.wav.
     Returns True if successful, False otherwise"""
-    if path.isfile(name) and path.splitext(name)[1] == ".wav":
-        shutil.copy(name, CURR)
-        writeTable("curr", None)
-    else: 
-        if name not in table:
-            return False
-        shutil.copy(path.join(SAVED, name + ".wav"), CURR)
+    # Saved names are the common case and only need a dict lookup; touch the
+    # filesystem only for what might be a path.
+    if name in table and name != "curr":
+        replaceCurr(path.join(SAVED, name + ".wav"))
         writeTable("curr", dict(table[name]))
+    elif name.endswith(".wav") and path.isfile(name):
+        replaceCurr(name)
+        writeTable("curr", None)
+    else:
+        return False
     return True
 
 @mcp.tool
@@ -169,10 +525,17 @@ def delete(name : str) -> bool:
     writeTable(name, None)
     return True
 
-@mcp.resource("data://recordings")
-def recordings() -> object:
-    """Returns a dict mapping a saved filename or "curr" to an object with a "size" attribute (the file size in bytes) and a "time" attribute (the runtime in seconds)."""
-    return table
+@mcp.resource("data://recordings", mime_type="application/json")
+def recordings() -> str:
+    """Returns a JSON object mapping a saved filename or "curr" to an object with a "size" attribute (the file size in bytes) and a "time" attribute (the runtime in seconds).
+    The "curr" entry also has a "path" attribute (the full file path of curr.wav)."""
+    # Polled far more often than the table changes, so serialize once per change
+    global listing
+    with flushed:
+        if listing is None:
+            shown = table if "curr" not in table else {**table, "curr" : {**table["curr"], "path" : CURR}}
+            listing = dumps(shown).decode()
+        return listing
 
 @mcp.resource("data://curr")
 def curr() -> str: